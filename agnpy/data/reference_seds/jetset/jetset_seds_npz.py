@@ -0,0 +1,14 @@
+# stack the jetset SEDs in a single binary file, read by the tests in place of
+# the text files, to be run again every time one of the SEDs is regenerated
+from pathlib import Path
+import numpy as np
+
+data_dir = Path(__file__).parent / "data"
+
+# one entry per text file, the key is the name of the file without extension
+tables = {
+    sample_file.stem: np.loadtxt(sample_file, delimiter=",", comments="#")
+    for sample_file in sorted(data_dir.glob("*.txt"))
+}
+np.savez(data_dir / "reference_seds.npz", **tables)
+print(f"stacked {len(tables)} SEDs in {data_dir / 'reference_seds.npz'}")
@@ -132,6 +132,23 @@ class Blob:
         self.gamma_e_size = gamma_size
         self.gamma_e_min = gamma_min
         self.gamma_e_max = gamma_max
+        self._update_gamma_e()
+
+    def _update_gamma_e(self):
+        """Compute the grid of electrons Lorentz factors and its logarithm, as
+        read-only contiguous float64 arrays. They are stored and recomputed
+        only when the size or the limits of the grid change."""
+        grid = (self.gamma_e_size, self.gamma_e_min, self.gamma_e_max)
+        if getattr(self, "_gamma_e_grid", None) == grid:
+            return
+        gamma = np.logspace(
+            np.log10(self.gamma_e_min), np.log10(self.gamma_e_max), self.gamma_e_size
+        )
+        self._gamma_e = np.ascontiguousarray(gamma, dtype=np.float64)
+        self._log_gamma_e = np.log(self._gamma_e)
+        self._gamma_e.flags.writeable = False
+        self._log_gamma_e.flags.writeable = False
+        self._gamma_e_grid = grid
 
     def set_gamma_p(self, gamma_size, gamma_min=1, gamma_max=1e8):
         """Set the array of Lorentz factors for the protons."""
@@ -143,9 +160,15 @@ class Blob:
     def gamma_e(self):
         """Array of electrons Lorentz factors, to be used for integration in the
         reference frame comoving with the emission region."""
-        return np.logspace(
-            np.log10(self.gamma_e_min), np.log10(self.gamma_e_max), self.gamma_e_size
-        )
+        self._update_gamma_e()
+        return self._gamma_e
+
+    @property
+    def log_gamma_e(self):
+        """Natural logarithm of :attr:`gamma_e`, to be passed to integrators
+        working in log space (e.g. :func:`~agnpy.utils.math.trapz_loglog`)."""
+        self._update_gamma_e()
+        return self._log_gamma_e
 
     @property
     def gamma_e_external_frame(self):
@@ -3,6 +3,7 @@ import numpy as np
 import astropy.units as u
 from astropy.constants import e, h, c, m_e, sigma_T
 from ..utils.math import axes_reshaper, gamma_e_to_integrate
+from ..utils.math_jit import vectorize
 from ..utils.conversion import nu_to_epsilon_prime, B_to_cgs, lambda_c_e
 
 
@@ -23,12 +24,24 @@ def R(x):
     return term_1_num / term_1_denom * term_2_num / term_2_denom * np.exp(-x)
 
 
+# charge and speed of light in cgs units, for the unitless kernels
+e_cgs = e.value
+c_cgs = c.cgs.value
+
+
+@vectorize(["float64(float64, float64, float64)"])
+def _nu_synch_peak_kernel(B, gamma, mass):
+    """peak frequency in Hz for B in Gauss and mass in g"""
+    return e_cgs * B / (2 * np.pi * mass * c_cgs) * gamma ** 2
+
+
 def nu_synch_peak(B, gamma, mass=m_e):
     """observed peak frequency for monoenergetic electrons
-    Eq. 7.19 in [DermerMenon2009]_"""
-    B = B_to_cgs(B)
-    nu_peak = (e * B / (2 * np.pi * mass * c)) * np.power(gamma, 2)
-    return nu_peak.to("Hz")
+    Eq. 7.19 in [DermerMenon2009]_, `gamma` can be an array of Lorentz factors"""
+    B = B_to_cgs(B).value
+    gamma = u.Quantity(gamma).to_value("")
+    mass = mass.to_value("g")
+    return _nu_synch_peak_kernel(B, gamma, mass) * u.Hz
 
 
 def calc_x(B_cgs, epsilon, gamma, mass=m_e):
@@ -51,11 +64,16 @@ def epsilon_B(B):
     return (B / B_cr).to_value("")
 
 
-def single_particle_synch_power(B_cgs, epsilon, gamma, mass=m_e):
+def single_particle_synch_power(B_cgs, epsilon, gamma, mass=m_e, dtype=np.float64):
     """angle-averaged synchrotron power for a single particle of mass m_e,
-    to be folded with the electron distribution
+    to be folded with the electron distribution, R(x) is evaluated with the
+    floating point precision `dtype`
     """
-    x = calc_x(B_cgs, epsilon, gamma, mass)
+    x = calc_x(B_cgs, epsilon, gamma, mass).astype(dtype, copy=False)
+    if np.dtype(dtype) != np.float64:
+        # exp(-x) vanishes well before x = 1e3, clip to avoid overflows of the
+        # powers of x in reduced precision
+        x = np.minimum(x, 1e3)
     prefactor = np.sqrt(3) * np.power(e, 3) * B_cgs / h
     return prefactor * R(x)
 
@@ -81,13 +99,102 @@ class Synchrotron:
         propagated to :func:`~agnpy.synchrotron.Synchrotron.sed_luminosity` and
         :func:`~agnpy.synchrotron.Synchrotron.sed_flux`.
     integrator : func
-        function to be used for integration (default = `np.trapz`)
+        function to be used for integration (default = `np.trapz`), the
+        log-space rules :func:`~agnpy.utils.math.trapz_loglog` and
+        :func:`~agnpy.utils.math.simpson_loglog` are also available, the latter
+        allowing for coarser grids of Lorentz factors at the same accuracy
+    dtype : type
+        floating point precision of the synchrotron kernel (default =
+        `np.float64`). The integrand is promoted back to `np.float64` when the
+        kernel is folded with the electron distribution, so `np.float32` only
+        pays off on large grids (of the order of thousands of Lorentz factors
+        and hundreds of frequencies), on small ones it can be slower
 	"""
 
-    def __init__(self, blob, ssa=False, integrator=np.trapz):
+    def __init__(self, blob, ssa=False, integrator=np.trapz, dtype=np.float64):
         self.blob = blob
         self.ssa = ssa
         self.integrator = integrator
+        self.dtype = dtype
+        # constants derived from the blob parameters and the parameters they
+        # were computed from, see Synchrotron._blob_constants
+        self._constants = None
+        self._constants_parameters = None
+
+    @staticmethod
+    def evaluate_blob_constants(d_L, delta_D, B, R_b):
+        r"""Quantities derived from the emission region parameters, common to
+        the full and to the delta-approximated SED computations: magnetic field
+        in cgs, its energy density and dimensionless cyclotron energy, volume
+        of the blob and beaming factor :math:`\delta_D^4 / d_L^2`.
+
+        Returns
+        -------
+        dict
+            dictionary of the derived quantities
+        """
+        B_cgs = B_to_cgs(B)
+        return {
+            "B_cgs": B_cgs,
+            "U_B": np.power(B_cgs, 2) / (8 * np.pi),
+            "epsilon_B": epsilon_B(B),
+            "V_b": 4 / 3 * np.pi * np.power(R_b, 3),
+            "beaming": np.power(delta_D, 4) / np.power(d_L, 2),
+        }
+
+    @property
+    def _blob_constants(self):
+        """Constants derived from the blob parameters, computed once and shared
+        by the SED methods. The blob is mutable: they are recomputed whenever
+        one of the parameters they depend on is changed."""
+        parameters = (self.blob.d_L, self.blob.delta_D, self.blob.B, self.blob.R_b)
+        if self._constants_parameters is None or not all(
+            np.all(new == old)
+            for new, old in zip(parameters, self._constants_parameters)
+        ):
+            self._constants = self.evaluate_blob_constants(*parameters)
+            # store copies, the parameters can be modified in place
+            self._constants_parameters = tuple(
+                u.Quantity(parameter, copy=True) for parameter in parameters
+            )
+        return self._constants
+
+    @staticmethod
+    def evaluate_synch_kernel(epsilon, B_cgs, gamma, dtype=np.float64):
+        """Single-particle synchrotron power on the (gamma, epsilon) grid, to be
+        folded with the electron distribution. It does not depend on the
+        electron distribution and it is shared by the emissivity and the SSA
+        opacity computations.
+
+        Parameters
+        ----------
+        epsilon : :class:`~numpy.ndarray`
+            array of dimensionless energies in the comoving frame
+        B_cgs : :class:`~astropy.units.Quantity`
+            magnetic field in the blob, in cgs Gauss units
+        gamma : :class:`~numpy.ndarray`
+            array of Lorentz factor over which to integrate the electron
+            distribution
+        dtype : type
+            floating point precision of the kernel
+
+        Returns
+        -------
+        :class:`~astropy.units.Quantity`
+            array of shape `(len(gamma), len(epsilon))`
+        """
+        _gamma, _epsilon = axes_reshaper(gamma, epsilon)
+        return single_particle_synch_power(B_cgs, _epsilon, _gamma, dtype=dtype)
+
+    @staticmethod
+    def _tau_ssa_from_integral(integral, epsilon, R_b):
+        """SSA opacity from the integral over the Lorentz factors of the SSA
+        integrand folded with the synchrotron kernel."""
+        prefactor_k_epsilon = (
+            -1 / (8 * np.pi * m_e * np.power(epsilon, 2)) * np.power(lambda_c_e / c, 3)
+        )
+        k_epsilon = (prefactor_k_epsilon * integral).to("cm-1")
+        return (2 * k_epsilon * R_b).to_value("")
 
     @staticmethod
     def evaluate_tau_ssa(
@@ -101,23 +208,26 @@ class Synchrotron:
         *args,
         integrator=np.trapz,
         gamma=gamma_e_to_integrate,
+        kernel=None,
+        dtype=np.float64,
     ):
         """Computes the syncrotron self-absorption opacity for a general set
         of model parameters, see :func:`~agnpy:sycnhrotron.Synchrotron.evaluate_sed_flux`
-        for parameters defintion. Eq. before 7.122 in [DermerMenon2009]_."""
+        for parameters defintion. Eq. before 7.122 in [DermerMenon2009]_.
+        The synchrotron kernel, if already computed with
+        :func:`~agnpy:sycnhrotron.Synchrotron.evaluate_synch_kernel`, can be
+        passed to avoid its re-evaluation."""
         # conversions
         epsilon = nu_to_epsilon_prime(nu, z, delta_D, m = m_e)
         B_cgs = B_to_cgs(B)
+        if kernel is None:
+            kernel = Synchrotron.evaluate_synch_kernel(epsilon, B_cgs, gamma, dtype)
         # multidimensional integration
-        _gamma, _epsilon = axes_reshaper(gamma, epsilon)
+        _gamma = np.reshape(gamma, (-1, 1))
         SSA_integrand = n_e.evaluate_SSA_integrand(_gamma, *args)
-        integrand = SSA_integrand * single_particle_synch_power(B_cgs, _epsilon, _gamma)
+        integrand = SSA_integrand * kernel
         integral = integrator(integrand, gamma, axis=0)
-        prefactor_k_epsilon = (
-            -1 / (8 * np.pi * m_e * np.power(epsilon, 2)) * np.power(lambda_c_e / c, 3)
-        )
-        k_epsilon = (prefactor_k_epsilon * integral).to("cm-1")
-        return (2 * k_epsilon * R_b).to_value("")
+        return Synchrotron._tau_ssa_from_integral(integral, epsilon, R_b)
 
     @staticmethod
     def evaluate_sed_flux(
@@ -132,6 +242,8 @@ class Synchrotron:
         ssa=False,
         integrator=np.trapz,
         gamma=gamma_e_to_integrate,
+        dtype=np.float64,
+        constants=None,
     ):
         r"""Evaluates the flux SED (:math:`\nu F_{\nu}`) due to synchrotron radiation,
         for a general set of model parameters. Eq. 21 in [Finke2008]_.
@@ -164,23 +276,32 @@ class Synchrotron:
         gamma : :class:`~numpy.ndarray`
             array of Lorentz factor over which to integrate the electron
             distribution
+        dtype : type
+            floating point precision of the synchrotron kernel, the
+            integration is always performed in `np.float64`
+        constants : dict
+            quantities derived from the blob parameters, as returned by
+            :func:`~agnpy.synchrotron.Synchrotron.evaluate_blob_constants`,
+            computed from `d_L`, `delta_D`, `B` and `R_b` if not given
 
         Returns
         -------
         :class:`~astropy.units.Quantity`
             array of the SED values corresponding to each frequency
         """
-        # conversions
+        if constants is None:
+            constants = Synchrotron.evaluate_blob_constants(d_L, delta_D, B, R_b)
         epsilon = nu_to_epsilon_prime(nu, z, delta_D, m = m_e)
-        B_cgs = B_to_cgs(B)
+        kernel = Synchrotron.evaluate_synch_kernel(
+            epsilon, constants["B_cgs"], gamma, dtype
+        )
         # reshape for multidimensional integration
-        _gamma, _epsilon = axes_reshaper(gamma, epsilon)
-        V_b = 4 / 3 * np.pi * np.power(R_b, 3)
-        N_e = V_b * n_e.evaluate(_gamma, *args)
+        _gamma = np.reshape(gamma, (-1, 1))
+        N_e = constants["V_b"] * n_e.evaluate(_gamma, *args)
         # fold the electron distribution with the synchrotron power
-        integrand = N_e * single_particle_synch_power(B_cgs, _epsilon, _gamma)
+        integrand = N_e * kernel
         emissivity = integrator(integrand, gamma, axis=0).reshape(epsilon.shape)
-        prefactor = np.power(delta_D, 4) / (4 * np.pi * np.power(d_L, 2))
+        prefactor = constants["beaming"] / (4 * np.pi)
         sed = (prefactor * epsilon * emissivity).to("erg cm-2 s-1")
 
         if ssa:
@@ -195,6 +316,7 @@ class Synchrotron:
                 *args,
                 integrator=integrator,
                 gamma=gamma,
+                kernel=kernel,
             )
             attenuation = tau_to_attenuation(tau)
             sed *= attenuation
@@ -202,18 +324,73 @@ class Synchrotron:
         return sed
 
     @staticmethod
-    def evaluate_sed_flux_delta_approx(nu, z, d_L, delta_D, B, R_b, n_e, *args):
+    def evaluate_sed_flux_batch(
+        nu,
+        z,
+        d_L,
+        delta_D,
+        B,
+        R_b,
+        n_e_list,
+        ssa=False,
+        integrator=np.trapz,
+        gamma=gamma_e_to_integrate,
+        dtype=np.float64,
+        constants=None,
+    ):
+        r"""Evaluates the flux SED (:math:`\nu F_{\nu}`) due to synchrotron
+        radiation for several electron distributions sharing the same emission
+        region. The synchrotron kernel is evaluated only once and folded with
+        each distribution, see
+        :func:`~agnpy:sycnhrotron.Synchrotron.evaluate_sed_flux` for the
+        definition of the other parameters.
+
+        Parameters
+        ----------
+        n_e_list : list of :class:`~agnpy.spectra.ElectronDistribution`
+            electron energy distributions, each evaluated with its own parameters
+
+        Returns
+        -------
+        :class:`~astropy.units.Quantity`
+            array of shape `(len(n_e_list), len(nu))` of the SED values
+        """
+        if constants is None:
+            constants = Synchrotron.evaluate_blob_constants(d_L, delta_D, B, R_b)
+        epsilon = nu_to_epsilon_prime(nu, z, delta_D, m = m_e)
+        kernel = Synchrotron.evaluate_synch_kernel(
+            epsilon, constants["B_cgs"], gamma, dtype
+        )
+        # stack the distributions along a first axis, integrate along gamma
+        _gamma = np.reshape(gamma, (-1, 1))
+        N_e = constants["V_b"] * u.Quantity([n_e(_gamma) for n_e in n_e_list])
+        integrand = N_e * kernel
+        emissivity = integrator(integrand, gamma, axis=1)
+        prefactor = constants["beaming"] / (4 * np.pi)
+        sed = (prefactor * epsilon * emissivity).to("erg cm-2 s-1")
+
+        if ssa:
+            SSA_integrand = u.Quantity([n_e.SSA_integrand(_gamma) for n_e in n_e_list])
+            integral = integrator(SSA_integrand * kernel, gamma, axis=1)
+            tau = Synchrotron._tau_ssa_from_integral(integral, epsilon, R_b)
+            sed *= tau_to_attenuation(tau)
+
+        return sed
+
+    @staticmethod
+    def evaluate_sed_flux_delta_approx(
+        nu, z, d_L, delta_D, B, R_b, n_e, *args, constants=None
+    ):
         """Synchrotron flux SED using the delta approximation for the
-        synchrotron radiation Eq. 7.70 [DermerMenon2009]_."""
+        synchrotron radiation Eq. 7.70 [DermerMenon2009]_. The quantities
+        derived from the blob parameters can be passed via `constants`, see
+        :func:`~agnpy.synchrotron.Synchrotron.evaluate_blob_constants`."""
+        if constants is None:
+            constants = Synchrotron.evaluate_blob_constants(d_L, delta_D, B, R_b)
         epsilon_prime = nu_to_epsilon_prime(nu, z, delta_D, m = m_e)
-        gamma_s = np.sqrt(epsilon_prime / epsilon_B(B))
-        B_cgs = B_to_cgs(B)
-        U_B = np.power(B_cgs, 2) / (8 * np.pi)
-        V_b = 4 / 3 * np.pi * np.power(R_b, 3)
-        N_e = V_b * n_e.evaluate(gamma_s, *args)
-        prefactor = (
-            np.power(delta_D, 4) * c * sigma_T * U_B / (6 * np.pi * np.power(d_L, 2))
-        )
+        gamma_s = np.sqrt(epsilon_prime / constants["epsilon_B"])
+        N_e = constants["V_b"] * n_e.evaluate(gamma_s, *args)
+        prefactor = constants["beaming"] * c * sigma_T * constants["U_B"] / (6 * np.pi)
         value = prefactor * np.power(gamma_s, 3) * N_e
         return value.to("erg cm-2 s-1")
 
@@ -232,6 +409,41 @@ class Synchrotron:
             ssa=self.ssa,
             integrator=self.integrator,
             gamma=self.blob.gamma_e,
+            dtype=self.dtype,
+            constants=self._blob_constants,
+        )
+
+    def sed_flux_batch(self, nu, n_e_list):
+        r"""Evaluates the synchrotron flux SED for several electron
+        distributions in place of the one of the blob, evaluating the
+        synchrotron kernel only once. The distributions are integrated over
+        the Lorentz factors of the blob, :attr:`~agnpy.emission_regions.Blob.gamma_e`.
+
+        Parameters
+        ----------
+        nu : :class:`~astropy.units.Quantity`
+            array of frequencies, in Hz, to compute the sed
+        n_e_list : list of :class:`~agnpy.spectra.ElectronDistribution`
+            electron energy distributions
+
+        Returns
+        -------
+        :class:`~astropy.units.Quantity`
+            array of shape `(len(n_e_list), len(nu))` of the SED values
+        """
+        return self.evaluate_sed_flux_batch(
+            nu,
+            self.blob.z,
+            self.blob.d_L,
+            self.blob.delta_D,
+            self.blob.B,
+            self.blob.R_b,
+            n_e_list,
+            ssa=self.ssa,
+            integrator=self.integrator,
+            gamma=self.blob.gamma_e,
+            dtype=self.dtype,
+            constants=self._blob_constants,
         )
 
     def sed_flux_delta_approx(self, nu):
@@ -246,6 +458,7 @@ class Synchrotron:
             self.blob.R_b,
             self.blob.n_e,
             *self.blob.n_e.parameters,
+            constants=self._blob_constants,
         )
 
     def sed_luminosity(self, nu):
@@ -0,0 +1,90 @@
+# fixtures shared by the tests
+import os
+from functools import lru_cache
+import numpy as np
+import astropy.units as u
+from astropy.constants import m_e
+import pytest
+from agnpy.emission_regions import Blob
+from agnpy.spectra import PowerLaw, LogParabola
+from .utils import make_comparison_plot, z_from_cm
+
+
+# parameters of the Blob and EED in Figure 7.4 Dermer and Menon 2009
+W_e = 1e48 * u.Unit("erg")
+R_b = 1e16 * u.cm
+V_b = 4 / 3 * np.pi * R_b ** 3
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--no-plots",
+        action="store_true",
+        default=False,
+        help="do not produce the synchrotron comparison figures, also set by "
+        "AGNPY_SKIP_PLOTS=1, the other test modules still produce theirs",
+    )
+
+
+@pytest.fixture(scope="session")
+def plots_enabled(request):
+    """Whether the comparison figures of the tests using `plot_fn` (currently
+    only the synchrotron ones) have to be produced, they can be disabled via the
+    command line or the AGNPY_SKIP_PLOTS environment variable."""
+    return not (
+        request.config.getoption("--no-plots")
+        or os.environ.get("AGNPY_SKIP_PLOTS") == "1"
+    )
+
+
+@pytest.fixture(scope="session")
+def plot_fn(plots_enabled):
+    """Function making the comparison plots, a no-op if the plots are disabled."""
+    if plots_enabled:
+        return make_comparison_plot
+    return lambda *args, **kwargs: None
+
+
+@pytest.fixture(scope="session")
+def z():
+    """Redshift of the blob in Figure 7.4 of Dermer and Menon 2009."""
+    return z_from_cm(1e27)
+
+
+@pytest.fixture(scope="session")
+def pwl_blob_factory(z):
+    """Factory of blobs of Figure 7.4 of Dermer and Menon 2009, with a
+    power-law electron distribution of given maximum Lorentz factor.
+    One blob is built per gamma_max and shared by the whole session."""
+
+    @lru_cache(maxsize=None)
+    def make_pwl_blob(gamma_max):
+        n_e = PowerLaw.from_total_energy(
+            W_e, V_b, m_e, p=2.8, gamma_min=1e2, gamma_max=gamma_max
+        )
+        return Blob(R_b=R_b, z=z, delta_D=10, Gamma=10, B=1 * u.G, n_e=n_e)
+
+    return make_pwl_blob
+
+
+@pytest.fixture(scope="session")
+def pwl_blob(pwl_blob_factory):
+    """Blob of Figure 7.4 of Dermer and Menon 2009 with a power-law electron
+    distribution (gamma_max = 1e7). It must not be modified."""
+    return pwl_blob_factory(1e7)
+
+
+@pytest.fixture(scope="session")
+def lp():
+    """Log-parabola electron distribution with the same total energy of the
+    power-law in Figure 7.4 of Dermer and Menon 2009."""
+    return LogParabola.from_total_energy(
+        W_e, V_b, m_e, p=2.8, q=0.2, gamma_0=1e3, gamma_min=1e2, gamma_max=1e5
+    )
+
+
+@pytest.fixture(scope="session")
+def lp_blob(lp, z):
+    """Blob of Figure 7.4 of Dermer and Menon 2009 with a log-parabola electron
+    distribution. Shared by the whole session, it must not be modified."""
+    return Blob(R_b=R_b, z=z, delta_D=10, Gamma=10, B=1 * u.G, n_e=lp)
@@ -4,7 +4,6 @@ import pytest
 import numpy as np
 import astropy.units as u
 from astropy.constants import M_sun, m_e
-from astropy.coordinates import Distance
 from agnpy.spectra import PowerLaw, BrokenPowerLaw
 from agnpy.emission_regions import Blob
 from agnpy.targets import (
@@ -42,7 +41,6 @@ R_b = 1e16 * u.cm
 V_b = 4 / 3 * np.pi * R_b ** 3
 W_e_ssc = 1e48 * u.Unit("erg")
 W_e_ec = 6e42 * u.Unit("erg")
-z_ssc = Distance(1e27, unit=u.cm).z
 z_ec = 1
 
 n_e_ec = BrokenPowerLaw.from_total_energy(
@@ -70,7 +68,7 @@ class TestSynchrotronSelfCompton:
     """Class grouping all tests related to the SynchrotronSelfCompton class."""
 
     @pytest.mark.parametrize("gamma_max, nu_range_max", [("1e5", 1e25), ("1e7", 1e27)])
-    def test_ssc_reference_sed(self, gamma_max, nu_range_max):
+    def test_ssc_reference_sed(self, z, gamma_max, nu_range_max):
         """Test agnpy SSC SED against the ones in Figure 7.4 of Dermer and Menon
         2009."""
         # reference SED
@@ -84,7 +82,7 @@ class TestSynchrotronSelfCompton:
         n_e = PowerLaw.from_total_energy(
             W_e_ssc, V_b, m_e, p=2.8, gamma_min=1e2, gamma_max=float(gamma_max)
         )
-        blob = Blob(R_b=R_b, z=z_ssc, delta_D=10, Gamma=10, B=1 * u.G, n_e=n_e)
+        blob = Blob(R_b=R_b, z=z, delta_D=10, Gamma=10, B=1 * u.G, n_e=n_e)
         ssc = SynchrotronSelfCompton(blob)
         sed_agnpy = ssc.sed_flux(nu_ref)
 
@@ -106,14 +104,14 @@ class TestSynchrotronSelfCompton:
         # requires that the SED points deviate less than 20% from the figure
         assert check_deviation(nu_ref, sed_agnpy, sed_ref, 0.2, nu_range)
 
-    def test_ssc_integration_methods(self):
+    def test_ssc_integration_methods(self, z):
         """Test different integration methods against each other:
         simple trapezoidal rule vs trapezoidal rule in log-log space.
         """
         n_e = PowerLaw.from_total_energy(
             W_e_ssc, V_b, m_e, p=2.8, gamma_min=1e2, gamma_max=1e7
         )
-        blob = Blob(R_b=R_b, z=z_ssc, delta_D=10, Gamma=10, B=1 * u.G, n_e=n_e)
+        blob = Blob(R_b=R_b, z=z, delta_D=10, Gamma=10, B=1 * u.G, n_e=n_e)
 
         ssc_trapz = SynchrotronSelfCompton(blob, integrator=np.trapz)
         ssc_trapz_loglog = SynchrotronSelfCompton(blob, integrator=trapz_loglog)
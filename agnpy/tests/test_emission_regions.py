@@ -61,6 +61,13 @@ class TestBlob:
         gamma = np.logspace(2, 6, 50)
         blob.set_gamma_e(len(gamma), gamma[0], gamma[-1])
         assert np.array_equal(blob.gamma_e, gamma)
+        assert np.allclose(blob.log_gamma_e, np.log(gamma), atol=0, rtol=1e-12)
+        # the grid is stored, but updated if its limits are changed directly
+        assert blob.gamma_e is blob.gamma_e
+        blob.gamma_e_max = 1e7
+        assert np.isclose(blob.gamma_e[-1], 1e7, atol=0, rtol=1e-12)
+        assert np.isclose(blob.log_gamma_e[-1], np.log(1e7), atol=0, rtol=1e-12)
+        blob.set_gamma_e(len(gamma), gamma[0], gamma[-1])
         blob.set_gamma_p(len(gamma), gamma[0], gamma[-1])
         assert np.array_equal(blob.gamma_p, gamma)
 
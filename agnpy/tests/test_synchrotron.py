@@ -2,16 +2,16 @@
 import numpy as np
 import astropy.units as u
 from astropy.constants import m_e
-from astropy.coordinates import Distance
 import pytest
+from functools import lru_cache, partial
 from pathlib import Path
 from agnpy.emission_regions import Blob
 from agnpy.spectra import PowerLaw, LogParabola, BrokenPowerLaw
 from agnpy.synchrotron import Synchrotron, nu_synch_peak
-from agnpy.utils.math import trapz_loglog
+from agnpy.utils.math import trapz_loglog, simpson_loglog
+from agnpy.utils.conversion import B_to_cgs
 
 from .utils import (
-    make_comparison_plot,
     extract_columns_sample_file,
     check_deviation,
     clean_and_make_dir,
@@ -20,22 +20,81 @@ from .utils import (
 agnpy_dir = Path(__file__).parent.parent.parent  # go to the agnpy root
 # where to read sampled files
 data_dir = agnpy_dir / "agnpy/data"
-# where to save figures, clean-up before making the new
-figures_dir = clean_and_make_dir(agnpy_dir, "crosschecks/figures/synchrotron")
 
+# frequency grids shared by the tests, read-only as they are never modified
+NU_SYNCH = np.logspace(10, 20) * u.Hz
+NU_WIDE = np.logspace(8, 23) * u.Hz
+NU_SYNCH.flags.writeable = False
+NU_WIDE.flags.writeable = False
 
-# parameters of the Blob and EED in Figure 7.4 Dermer and Menon 2009
-W_e = 1e48 * u.Unit("erg")
-R_b = 1e16 * u.cm
-V_b = 4 / 3 * np.pi * R_b ** 3
-z = Distance(1e27, unit=u.cm).z
+
+@pytest.fixture(scope="session")
+def figures_dir(plots_enabled):
+    """Where to save figures, clean-up before making the new. The directory is
+    created only once, at the first test requesting it, and only if the
+    comparison plots are enabled."""
+    if plots_enabled:
+        return clean_and_make_dir(agnpy_dir, "crosschecks/figures/synchrotron")
+    return agnpy_dir / "crosschecks/figures/synchrotron"
+
+
+# electron distributions used to produce the jetset SSA SEDs, the keys are
+# the ones in the names of the reference files
+SSA_N_E = {
+    "pwl": lambda: PowerLaw.from_total_density(
+        n_tot=1e2 * u.Unit("cm-3"), mass=m_e, p=2, gamma_min=2, gamma_max=1e6
+    ),
+    "bpwl": lambda: BrokenPowerLaw.from_total_density(
+        n_tot=1e2 * u.Unit("cm-3"),
+        mass=m_e,
+        p1=2,
+        p2=3,
+        gamma_b=1e4,
+        gamma_min=2,
+        gamma_max=1e6,
+    ),
+    "lp": lambda: LogParabola.from_total_density(
+        n_tot=1e2 * u.Unit("cm-3"),
+        mass=m_e,
+        p=2,
+        q=0.4,
+        gamma_0=1e4,
+        gamma_min=2,
+        gamma_max=1e6,
+    ),
+}
+SSA_N_E_NAMES = {
+    "pwl": "power-law",
+    "bpwl": "broken power-law",
+    "lp": "log-parabola",
+}
+
+
+@lru_cache(maxsize=None)
+def ssa_n_e(key):
+    """Electron distributions of the SSA tests, built only at the first request."""
+    return SSA_N_E[key]()
+
+
+@pytest.fixture
+def n_e_dist(key):
+    """Electron distribution of the SSA test identified by `key`."""
+    return ssa_n_e(key)
+
+
+@lru_cache(maxsize=None)
+def cached_synchrotron(blob, ssa=False):
+    """Synchrotron objects are built once per blob and shared among the tests."""
+    return Synchrotron(blob, ssa=ssa)
 
 
 class TestSynchrotron:
     """Class grouping all tests related to the Synchrotron class."""
 
     @pytest.mark.parametrize("gamma_max, nu_range_max", [("1e5", 1e18), ("1e7", 1e22)])
-    def test_synch_reference_sed(self, gamma_max, nu_range_max):
+    def test_synch_reference_sed(
+        self, plot_fn, figures_dir, pwl_blob_factory, gamma_max, nu_range_max
+    ):
         """Test agnpy synchrotron SED against the ones in Figure 7.4 of Dermer
         and Menon 2009."""
         # reference SED
@@ -45,17 +104,13 @@ class TestSynchrotron:
             "erg cm-2 s-1",
         )
 
-        # agnpy
-        n_e = PowerLaw.from_total_energy(
-            W_e, V_b, m_e, p=2.8, gamma_min=1e2, gamma_max=float(gamma_max)
-        )
-        blob = Blob(R_b=R_b, z=z, delta_D=10, Gamma=10, B=1 * u.G, n_e=n_e)
-        synch = Synchrotron(blob)
+        # agnpy, a different blob is built for each gamma_max, none is modified
+        synch = cached_synchrotron(pwl_blob_factory(float(gamma_max)))
         sed_agnpy = synch.sed_flux(nu_ref)
 
         # sed comparison plot
         nu_range = [1e10, nu_range_max] * u.Hz
-        make_comparison_plot(
+        plot_fn(
             nu_ref,
             sed_agnpy,
             sed_ref,
@@ -70,61 +125,21 @@ class TestSynchrotron:
         # requires that the SED points deviate less than 25% from the figure
         assert check_deviation(nu_ref, sed_agnpy, sed_ref, 0.25, nu_range)
 
-    @pytest.mark.parametrize(
-        "file_ref , n_e, figure_title, figure_path",
-        [
-            (
-                f"{data_dir}/reference_seds/jetset/data/synch_ssa_pwl_jetset_1.1.2.txt",
-                PowerLaw.from_total_density(
-                    n_tot=1e2 * u.Unit("cm-3"),
-                    mass=m_e,
-                    p=2,
-                    gamma_min=2,
-                    gamma_max=1e6,
-                ),
-                "Self-Absorbed Synchrotron, power-law electron distribution",
-                f"{figures_dir}/ssa_pwl_comparison_jetset_1.1.2.png",
-            ),
-            (
-                f"{data_dir}/reference_seds/jetset/data/synch_ssa_bpwl_jetset_1.1.2.txt",
-                BrokenPowerLaw.from_total_density(
-                    n_tot=1e2 * u.Unit("cm-3"),
-                    mass=m_e,
-                    p1=2,
-                    p2=3,
-                    gamma_b=1e4,
-                    gamma_min=2,
-                    gamma_max=1e6,
-                ),
-                "Self-Absorbed Synchrotron, broken power-law electron distribution",
-                f"{figures_dir}/ssa_bpwl_comparison_jetset_1.1.2.png",
-            ),
-            (
-                f"{data_dir}/reference_seds/jetset/data/synch_ssa_lp_jetset_1.1.2.txt",
-                LogParabola.from_total_density(
-                    n_tot=1e2 * u.Unit("cm-3"),
-                    mass=m_e,
-                    p=2,
-                    q=0.4,
-                    gamma_0=1e4,
-                    gamma_min=2,
-                    gamma_max=1e6,
-                ),
-                "Self-Absorbed Synchrotron, log-parabola electron distribution",
-                f"{figures_dir}/ssa_lp_comparison_jetset_1.1.2.png",
-            ),
-        ],
-    )
-    def test_ssa_reference_sed(
-        self, file_ref, n_e, figure_title, figure_path,
-    ):
+    @pytest.mark.parametrize("key", list(SSA_N_E))
+    def test_ssa_reference_sed(self, plot_fn, figures_dir, key, n_e_dist):
         """Test SSA SED generated by a given electron distribution against the
         ones generated with jetset version 1.1.2, via jetset_ssa_sed.py script."""
         # reference SED
-        nu_ref, sed_ref = extract_columns_sample_file(file_ref, "Hz", "erg cm-2 s-1")
+        nu_ref, sed_ref = extract_columns_sample_file(
+            f"{data_dir}/reference_seds/jetset/data/synch_ssa_{key}_jetset_1.1.2.txt",
+            "Hz",
+            "erg cm-2 s-1",
+        )
 
         # same parameters used to produce the jetset SED
-        blob = Blob(R_b=5e15 * u.cm, z=0.1, delta_D=10, Gamma=10, B=0.1 * u.G, n_e=n_e)
+        blob = Blob(
+            R_b=5e15 * u.cm, z=0.1, delta_D=10, Gamma=10, B=0.1 * u.G, n_e=n_e_dist
+        )
 
         # recompute the SED at the same ordinates where the figure was sampled
         synch = Synchrotron(blob, ssa=True)
@@ -132,14 +147,14 @@ class TestSynchrotron:
 
         # sed comparison plot, we will check between 10^(11) and 10^(19) Hz
         nu_range = [1e11, 1e19] * u.Hz
-        make_comparison_plot(
+        plot_fn(
             nu_ref,
             sed_agnpy,
             sed_ref,
             "agnpy",
             "jetset 1.1.2",
-            figure_title,
-            figure_path,
+            f"Self-Absorbed Synchrotron, {SSA_N_E_NAMES[key]} electron distribution",
+            figures_dir / f"ssa_{key}_comparison_jetset_1.1.2.png",
             "sed",
             comparison_range=nu_range.to_value("Hz"),
         )
@@ -147,22 +162,33 @@ class TestSynchrotron:
         # requires that the SED points deviate less than 5% from the figure
         assert check_deviation(nu_ref, sed_agnpy, sed_ref, 0.05, nu_range)
 
-    def test_synch_delta_sed(self):
+    @pytest.mark.parametrize("ssa", [False, True])
+    def test_sed_flux_batch(self, ssa):
+        """Check that the SEDs computed for several electron distributions in a
+        single call coincide with the ones computed separately."""
+        n_e_list = [ssa_n_e(key) for key in SSA_N_E]
+        nu = NU_SYNCH
+        blob = Blob(
+            R_b=5e15 * u.cm, z=0.1, delta_D=10, Gamma=10, B=0.1 * u.G, n_e=n_e_list[0]
+        )
+        seds_batch = Synchrotron(blob, ssa=ssa).sed_flux_batch(nu, n_e_list)
+        for n_e, sed_batch in zip(n_e_list, seds_batch):
+            blob.n_e = n_e
+            sed = Synchrotron(blob, ssa=ssa).sed_flux(nu)
+            assert u.allclose(sed_batch, sed, atol=0 * sed.unit, rtol=1e-10)
+
+    def test_synch_delta_sed(self, plot_fn, figures_dir, lp_blob):
         """Check that in a given frequency range the full synchrotron SED coincides
         with the delta function approximation."""
-        n_e = LogParabola.from_total_energy(
-            W_e, V_b, m_e, p=2.8, q=0.2, gamma_0=1e3, gamma_min=1e2, gamma_max=1e5
-        )
-        blob = Blob(R_b=R_b, z=z, delta_D=10, Gamma=10, B=1 * u.G, n_e=n_e)
-        synch = Synchrotron(blob)
+        synch = Synchrotron(lp_blob)
 
-        nu = np.logspace(10, 20) * u.Hz
+        nu = NU_SYNCH
         sed_full = synch.sed_flux(nu)
         sed_delta = synch.sed_flux_delta_approx(nu)
 
         # range of comparison
         nu_range = [1e12, 1e17] * u.Hz
-        make_comparison_plot(
+        plot_fn(
             nu,
             sed_delta,
             sed_full,
@@ -178,25 +204,60 @@ class TestSynchrotron:
         # requires that the delta approximation SED points deviate less than 10%
         assert check_deviation(nu, sed_delta, sed_full, 0.1, nu_range)
 
-    def test_sed_integration_methods(self):
+    def test_blob_constants(self, lp):
+        """Check that the constants derived from the blob are shared among the
+        SED methods and recomputed when the blob is modified."""
+        blob = Blob(R_b=1e16 * u.cm, z=0.069, delta_D=10, Gamma=10, B=1 * u.G, n_e=lp)
+        synch = Synchrotron(blob)
+        constants = synch._blob_constants
+        assert synch._blob_constants is constants
+        sed = synch.sed_flux(NU_SYNCH)
+        sed_delta = synch.sed_flux_delta_approx(NU_SYNCH)
+        assert synch._blob_constants is constants
+        # same values without the shared constants
+        assert u.allclose(
+            sed_delta,
+            Synchrotron.evaluate_sed_flux_delta_approx(
+                NU_SYNCH, blob.z, blob.d_L, blob.delta_D, blob.B, blob.R_b, lp, *lp.parameters
+            ),
+            atol=0 * u.Unit("erg cm-2 s-1"),
+        )
+        # a change of the magnetic field has to be propagated
+        blob.B = 2 * u.G
+        assert synch._blob_constants is not constants
+        assert u.isclose(synch._blob_constants["B_cgs"], 2 * B_to_cgs(1 * u.G))
+        assert not u.allclose(synch.sed_flux(NU_SYNCH), sed)
+        # as well as in-place changes of the parameters
+        blob.B *= 2
+        assert u.allclose(
+            synch.sed_flux(NU_SYNCH),
+            Synchrotron(blob).sed_flux(NU_SYNCH),
+            atol=0 * u.Unit("erg cm-2 s-1"),
+        )
+        blob.R_b *= 2
+        assert u.allclose(
+            synch.sed_flux_delta_approx(NU_SYNCH),
+            Synchrotron(blob).sed_flux_delta_approx(NU_SYNCH),
+            atol=0 * u.Unit("erg cm-2 s-1"),
+        )
+
+    def test_sed_integration_methods(self, plot_fn, figures_dir, pwl_blob):
         """Test different integration methods against each other:
         simple trapezoidal rule vs trapezoidal rule in log-log space.
         """
-        n_e = PowerLaw.from_total_energy(
-            W_e, V_b, m_e, p=2.8, gamma_min=1e2, gamma_max=1e7
+        synch_trapz = Synchrotron(pwl_blob, integrator=np.trapz)
+        # the logarithm of the Lorentz factors is already stored in the blob
+        synch_trapz_loglog = Synchrotron(
+            pwl_blob, integrator=partial(trapz_loglog, log_x=pwl_blob.log_gamma_e)
         )
-        blob = Blob(R_b=R_b, z=z, delta_D=10, Gamma=10, B=1 * u.G, n_e=n_e)
-
-        synch_trapz = Synchrotron(blob, integrator=np.trapz)
-        synch_trapz_loglog = Synchrotron(blob, integrator=trapz_loglog)
 
-        nu = np.logspace(8, 23) * u.Hz
+        nu = NU_WIDE
         sed_synch_trapz = synch_trapz.sed_flux(nu)
         sed_synch_trapz_loglog = synch_trapz_loglog.sed_flux(nu)
 
         # sed comparison plot
         nu_range = [1e8, 1e22] * u.Hz
-        make_comparison_plot(
+        plot_fn(
             nu,
             sed_synch_trapz_loglog,
             sed_synch_trapz,
@@ -214,8 +275,52 @@ class TestSynchrotron:
             nu, sed_synch_trapz_loglog, sed_synch_trapz, 0.01, nu_range
         )
 
+    def test_sed_single_precision(self, pwl_blob):
+        """Test the SED computed with a single precision synchrotron kernel
+        against the one computed in double precision."""
+        synch_float32 = Synchrotron(pwl_blob, dtype=np.float32)
+        synch_float64 = Synchrotron(pwl_blob)
+
+        nu = NU_WIDE
+        sed_float32 = synch_float32.sed_flux(nu)
+        sed_float64 = synch_float64.sed_flux(nu)
+
+        # requires that the SED points deviate less than 0.01%
+        nu_range = [1e8, 1e22] * u.Hz
+        assert check_deviation(nu, sed_float32, sed_float64, 1e-4, nu_range)
+
+    def test_sed_simpson_loglog(self, pwl_blob):
+        """Test the Simpson's rule in log space on a coarse grid of Lorentz
+        factors against the trapezoidal rule in log-log space on the default one.
+        """
+        blob_coarse = Blob(
+            R_b=pwl_blob.R_b,
+            z=pwl_blob.z,
+            delta_D=10,
+            Gamma=10,
+            B=1 * u.G,
+            n_e=pwl_blob.n_e,
+            gamma_e_size=51,
+        )
+        synch_simpson_loglog = Synchrotron(blob_coarse, integrator=simpson_loglog)
+        synch_trapz_loglog = Synchrotron(pwl_blob, integrator=trapz_loglog)
+
+        nu = NU_WIDE
+        sed_synch_simpson_loglog = synch_simpson_loglog.sed_flux(nu)
+        sed_synch_trapz_loglog = synch_trapz_loglog.sed_flux(nu)
+
+        # requires that the SED points deviate less than 1%
+        nu_range = [1e8, 1e22] * u.Hz
+        assert check_deviation(
+            nu, sed_synch_simpson_loglog, sed_synch_trapz_loglog, 0.01, nu_range
+        )
+
     def test_nu_synch_peak(self):
         """Test peak synchrotron frequency for a given magnetic field and Lorentz factor."""
         gamma = 100
         nu_synch = nu_synch_peak(1 * u.G, gamma).to_value("Hz")
         assert np.isclose(nu_synch, 27992489872.33304, atol=0)
+        # array of Lorentz factors, the peak frequency scales as gamma^2
+        gamma = np.asarray([1e2, 1e3, 1e4])
+        nu_synch = nu_synch_peak(1 * u.G, gamma).to_value("Hz")
+        assert np.allclose(nu_synch, 27992489872.33304 * (gamma / 1e2) ** 2, atol=0)
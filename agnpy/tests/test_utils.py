@@ -6,7 +6,12 @@ from pathlib import Path
 import agnpy.utils.math as math
 import agnpy.utils.geometry as geom
 from agnpy.utils.plot import load_mpl_rc, plot_sed
-from .utils import clean_and_make_dir
+from .utils import (
+    clean_and_make_dir,
+    range_mask,
+    check_deviation,
+    load_stacked_table,
+)
 
 twopi = 2 * np.pi
 
@@ -39,6 +44,52 @@ class TestMathUtils:
         analytical_integral = integral_line_loglog(x[0], x[-1], m, n)
         assert np.isclose(trapz_loglog_integral, analytical_integral, atol=0, rtol=0.01)
 
+    @pytest.mark.parametrize("axis", [0, 1])
+    def test_trapz_loglog_jit(self, axis, monkeypatch):
+        """test the numba-compiled trapz loglog against the numpy implementation"""
+        pytest.importorskip("numba")
+        x = np.logspace(2, 5)
+        m = np.arange(-2, 2.5, 0.5)
+        y = line_loglog(x[:, np.newaxis], m, 0.5)
+        # put a zero in the array to check the masking of the null intervals
+        y[10] = 0
+        if axis == 1:
+            y = y.T
+        jit_integral = math.trapz_loglog(y, x, axis=axis)
+        monkeypatch.setattr(math, "numba_available", False)
+        numpy_integral = math.trapz_loglog(y, x, axis=axis)
+        assert np.allclose(jit_integral, numpy_integral, atol=0, rtol=1e-10)
+        # providing the logarithm of x should not change the result
+        numpy_integral = math.trapz_loglog(y, x, axis=axis, log_x=np.log(x))
+        assert np.allclose(jit_integral, numpy_integral, atol=0, rtol=1e-10)
+
+    @pytest.mark.parametrize("m", np.arange(-2, 2.5, 0.5))
+    @pytest.mark.parametrize("size", [50, 51])
+    def test_simpson_loglog(self, m, size):
+        """test simpson loglog integral method, with an even and odd number of
+        points (the latter can use the numba-compiled kernel)"""
+        x = np.logspace(2, 5, size)
+        y = line_loglog(x, m, 0.5)
+        simpson_loglog_integral = math.simpson_loglog(y, x, axis=0)
+        analytical_integral = integral_line_loglog(x[0], x[-1], m, 0.5)
+        assert np.isclose(
+            simpson_loglog_integral, analytical_integral, atol=0, rtol=2e-3
+        )
+
+    @pytest.mark.parametrize("axis", [0, 1])
+    def test_simpson_loglog_jit(self, axis, monkeypatch):
+        """test the numba-compiled simpson loglog against the scipy implementation"""
+        pytest.importorskip("numba")
+        x = np.logspace(2, 5, 51)
+        m = np.arange(-2, 2.5, 0.5)
+        y = line_loglog(x[:, np.newaxis], m, 0.5)
+        if axis == 1:
+            y = y.T
+        jit_integral = math.simpson_loglog(y, x, axis=axis)
+        monkeypatch.setattr(math, "numba_available", False)
+        scipy_integral = math.simpson_loglog(y, x, axis=axis)
+        assert np.allclose(jit_integral, scipy_integral, atol=0, rtol=1e-10)
+
 
 class TestUtilsGeometry:
     """test utils.geometry"""
@@ -217,3 +268,40 @@ class TestPlotUtils:
 
         assert line_2d.get_linewidth() == kwargs["linewidth"]
         assert line_2d.get_color() == kwargs["color"]
+
+
+class TestTestingUtils:
+    """test the utilities of the test suite"""
+
+    def test_range_mask(self):
+        """check the mask of the comparison range for 2-dimensional arrays and
+        ranges given in units different from the ones of the array"""
+        x = np.logspace(8, 23, 50).reshape(5, 10)
+        mask = range_mask(x, [1e10, 1e22])
+        assert mask.shape == x.shape
+        assert np.array_equal(mask, (x >= 1e10) & (x <= 1e22))
+        # quantities, the range is converted to the unit of the array
+        nu = x * u.Hz
+        mask_units = range_mask(nu, [1e10 * u.Hz, 1e13 * u.kHz])
+        assert np.array_equal(mask_units, (x >= 1e10) & (x <= 1e16))
+        assert np.array_equal(range_mask(nu.to("GHz"), [1e10, 1e16] * u.Hz), mask_units)
+        # the mask can be used in check_deviation
+        assert check_deviation(x, x, x, 0.1, [1e10, 1e22])
+
+    @pytest.mark.parametrize(
+        "sample_file",
+        sorted(
+            (Path(__file__).parent.parent / "data/reference_seds/jetset/data").glob(
+                "*.txt"
+            )
+        ),
+        ids=lambda sample_file: sample_file.stem,
+    )
+    def test_stacked_tables(self, sample_file):
+        """check that the stacked tables read by the tests are the same as the
+        text files, jetset_seds_npz.py has to be run after changing any of them"""
+        stacked_table = load_stacked_table(sample_file)
+        assert stacked_table is not None
+        assert np.array_equal(
+            stacked_table, np.loadtxt(sample_file, delimiter=",", comments="#")
+        )
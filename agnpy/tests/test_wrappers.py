@@ -2,7 +2,6 @@
 import numpy as np
 import astropy.units as u
 from astropy.constants import m_e, M_sun
-from astropy.coordinates import Distance
 import pytest
 import matplotlib.pyplot as plt
 from pathlib import Path
@@ -19,7 +18,12 @@ from agnpy.targets import SSDisk, SphericalShellBLR, RingDustTorus
 from agnpy.synchrotron import Synchrotron
 from agnpy.compton import SynchrotronSelfCompton, ExternalCompton
 from agnpy.fit import SynchrotronSelfComptonModel, ExternalComptonModel
-from .utils import make_comparison_plot, check_deviation, clean_and_make_dir
+from .utils import (
+    make_comparison_plot,
+    check_deviation,
+    clean_and_make_dir,
+    z_from_cm,
+)
 
 
 agnpy_dir = Path(__file__).parent.parent
@@ -33,7 +37,7 @@ R_b = 1e16 * u.cm
 V_b = 4 / 3 * np.pi * R_b**3
 W_e_ssc = 1e48 * u.Unit("erg")
 W_e_ec = 6e42 * u.Unit("erg")
-z_ssc = Distance(1e27, unit=u.cm).z
+z_ssc = z_from_cm(1e27)
 z_ec = 1
 
 n_e_ssc = PowerLaw.from_total_energy(
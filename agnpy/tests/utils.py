@@ -1,8 +1,10 @@
 # utils for testing
 import shutil
+from functools import lru_cache
 from pathlib import Path, PosixPath
 import numpy as np
 import astropy.units as u
+from astropy.coordinates import Distance
 import matplotlib.pyplot as plt
 
 SED_X_LABEL = r"$\nu\,/\,{\rm Hz}$"
@@ -15,6 +17,10 @@ TAU_DEVIATION_LABEL = (
     r"$\tau_{\gamma\gamma, \rm agnpy}\,/\,\tau_{\gamma\gamma, \rm reference}$ - 1"
 )
 
+# name of the files stacking the sample files of a directory, see
+# agnpy/data/reference_seds/jetset/jetset_seds_npz.py
+REFERENCE_SEDS_NPZ = "reference_seds.npz"
+
 
 def clean_and_make_dir(main_dir, sub_dir=None):
     """Generate a sub directory in a main directory, remove it (recursively if
@@ -48,14 +54,66 @@ def clean_and_make_dir(main_dir, sub_dir=None):
     return _dir
 
 
+@lru_cache(maxsize=None)
+def _open_stacked_tables(stacked_file):
+    """Open a .npz file of stacked sample tables, the tables are read lazily."""
+    return np.load(stacked_file)
+
+
+def load_stacked_table(sample_file):
+    """Load the table of a sample file from the REFERENCE_SEDS_NPZ file in its
+    directory, if it exists and contains it. Returns None otherwise."""
+    sample_file = Path(sample_file)
+    stacked_file = sample_file.parent / REFERENCE_SEDS_NPZ
+    if not stacked_file.exists():
+        return None
+    stacked_tables = _open_stacked_tables(stacked_file)
+    if sample_file.stem not in stacked_tables.files:
+        return None
+    return stacked_tables[sample_file.stem]
+
+
+def load_sample_table(sample_file):
+    """Load the table of a sample file. It is read from the stacked tables next
+    to it, if available, see load_stacked_table, otherwise from the text."""
+    sample_table = load_stacked_table(sample_file)
+    if sample_table is not None:
+        return sample_table
+    return np.loadtxt(sample_file, delimiter=",", comments="#")
+
+
+@lru_cache(maxsize=None)
 def extract_columns_sample_file(sample_file, x_unit, y_unit=None):
-    """Return two arrays of quantities from a sample file."""
-    sample_table = np.loadtxt(sample_file, delimiter=",", comments="#")
+    """Return two arrays of quantities from a sample file.
+    The result is memoized and shared by the tests, the arrays are read-only."""
+    sample_table = load_sample_table(sample_file)
     x = sample_table[:, 0] * u.Unit(x_unit)
     y = sample_table[:, 1] if y_unit is None else sample_table[:, 1] * u.Unit(y_unit)
+    x.flags.writeable = False
+    y.flags.writeable = False
     return x, y
 
 
+@lru_cache(maxsize=None)
+def z_from_cm(d_L):
+    """Redshift corresponding to a luminosity distance in cm, in the default
+    cosmology. Solving for it is expensive, hence it is computed once per
+    distance and shared by all the test modules."""
+    return Distance(d_L, unit=u.cm).z
+
+
+def range_mask(x, x_range):
+    """Boolean mask, with the shape of x, of the values of x within x_range.
+    If x is a quantity, the limits of x_range are converted to its unit."""
+    if isinstance(x, u.Quantity):
+        x_min = u.Quantity(x_range[0]).to_value(x.unit)
+        x_max = u.Quantity(x_range[1]).to_value(x.unit)
+        x = x.value
+    else:
+        x_min, x_max = x_range[0], x_range[1]
+    return (x >= x_min) * (x <= x_max)
+
+
 def check_deviation(x, y_comp, y_ref, rtol, x_range=None):
     """Check the deviation of two quantities within a given range of x
     when setting atol = 0 in np.allclose it will check that
@@ -66,7 +124,7 @@ def check_deviation(x, y_comp, y_ref, rtol, x_range=None):
     the reference (a < b).
     """
     if x_range is not None:
-        condition = (x >= x_range[0]) * (x <= x_range[1])
+        condition = range_mask(x, x_range)
         y_ref = y_ref[condition]
         y_comp = y_comp[condition]
     return np.allclose(y_comp, y_ref, atol=0, rtol=rtol)
@@ -1,6 +1,8 @@
 # math utilities for agnpy
 import numpy as np
 import astropy.units as u
+from scipy.integrate import simpson
+from .math_jit import numba_available, trapz_loglog_jit, simpson_loglog_jit
 
 # default arrays to be used for integration
 gamma_e_to_integrate = np.logspace(1, 9, 200)
@@ -52,10 +54,12 @@ def log(x):
     return np.log(values)
 
 
-def trapz_loglog(y, x, axis=0):
+def trapz_loglog(y, x, axis=0, log_x=None):
     """
     Integrate a function approximating its discrete intervals as power-laws
-    (straight lines in log-log space), largely copied from naima
+    (straight lines in log-log space), largely copied from naima.
+    If numba is installed and `x` is 1-dimensional, the integration is
+    performed by the compiled kernel in :mod:`~agnpy.utils.math_jit`.
 
     Parameters
     ----------
@@ -65,6 +69,9 @@ def trapz_loglog(y, x, axis=0):
         independent variable to integrate over
     axis : int, optional
         along which axis the integration has to be performed
+    log_x : array_like, optional
+        natural logarithm of `x` (unitless), if already available it will not
+        be recomputed, e.g. :attr:`~agnpy.emission_regions.Blob.log_gamma_e`
 
     Returns
     -------
@@ -82,6 +89,9 @@ def trapz_loglog(y, x, axis=0):
     except AttributeError:
         x_unit = 1.0
 
+    if numba_available and np.ndim(x) == 1:
+        return trapz_loglog_jit(y, x, axis, log_x) * x_unit * y_unit
+
     slice_low = [slice(None)] * y.ndim
     slice_up = [slice(None)] * y.ndim
     # multi-dimensional equivalent of x_low = x[:-1]
@@ -94,19 +104,26 @@ def trapz_loglog(y, x, axis=0):
         shape = [1] * y.ndim
         shape[axis] = x.shape[0]
         x = x.reshape(shape)
+        if log_x is not None:
+            log_x = np.reshape(log_x, shape)
+
+    if log_x is None:
+        log_x = log(x)
 
     x_low = x[tuple(slice_low)]
     x_up = x[tuple(slice_up)]
+    log_x_low = log_x[tuple(slice_low)]
+    log_x_up = log_x[tuple(slice_up)]
     y_low = y[tuple(slice_low)]
     y_up = y[tuple(slice_up)]
 
     # slope in the given logarithmic bin
-    m = (log(y_low) - log(y_up)) / (log(x_low) - log(x_up))
+    m = (log(y_low) - log(y_up)) / (log_x_low - log_x_up)
 
     vals = np.where(
         np.abs(m + 1) > 1e-10,
         y_low / (m + 1) * (x_up * np.power(x_up / x_low, m) - x_low),
-        x_low * y_low * log(x_up / x_low),
+        x_low * y_low * (log_x_up - log_x_low),
     )
 
     tozero = (
@@ -117,3 +134,61 @@ def trapz_loglog(y, x, axis=0):
     vals[tozero] = 0.0
 
     return np.add.reduce(vals, axis) * x_unit * y_unit
+
+
+def simpson_loglog(y, x, axis=0, log_x=None):
+    r"""
+    Integrate a function applying the composite Simpson's rule in the logarithm
+    of the independent variable,
+    :math:`\int y\,{\rm d}x = \int x\,y\,{\rm d}(\log x)`.
+    Being a higher-order rule, it reaches the accuracy of
+    :func:`~agnpy.utils.math.trapz_loglog` with coarser grids (e.g. a smaller
+    number of Lorentz factors). If numba is installed, `x` is 1-dimensional and
+    has an odd number of points, the integration is performed by the compiled
+    kernel in :mod:`~agnpy.utils.math_jit`, otherwise by
+    :func:`scipy.integrate.simpson`.
+
+    Parameters
+    ----------
+    y : array_like
+        array to integrate
+    x : array_like, optional
+        independent variable to integrate over
+    axis : int, optional
+        along which axis the integration has to be performed
+    log_x : array_like, optional
+        natural logarithm of `x` (unitless), if already available it will not
+        be recomputed, e.g. :attr:`~agnpy.emission_regions.Blob.log_gamma_e`
+
+    Returns
+    -------
+    simpson : float
+        Definite integral as approximated by Simpson's rule in log space.
+    """
+    try:
+        y_unit = y.unit
+        y = y.value
+    except AttributeError:
+        y_unit = 1.0
+    try:
+        x_unit = x.unit
+        x = x.value
+    except AttributeError:
+        x_unit = 1.0
+
+    if numba_available and np.ndim(x) == 1 and np.size(x) % 2 == 1:
+        return simpson_loglog_jit(y, x, axis, log_x) * x_unit * y_unit
+
+    # reshape x to be broadcastable with y
+    if np.ndim(x) == 1:
+        shape = [1] * np.ndim(y)
+        shape[axis] = np.size(x)
+        x = np.reshape(x, shape)
+        if log_x is not None:
+            log_x = np.reshape(log_x, shape)
+
+    if log_x is None:
+        log_x = log(x)
+
+    log_x = np.broadcast_to(log_x, np.shape(y))
+    return simpson(y * x, x=log_x, axis=axis) * x_unit * y_unit
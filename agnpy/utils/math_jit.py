@@ -0,0 +1,155 @@
+# numba-compiled kernels for the math utilities of agnpy
+import numpy as np
+
+try:
+    import numba as nb
+
+    numba_available = True
+except ImportError:
+    numba_available = False
+
+
+__all__ = ["numba_available", "vectorize", "trapz_loglog_jit", "simpson_loglog_jit"]
+
+# smallest and largest positive float, same clipping as agnpy.utils.math.log
+_ftiny = np.finfo(np.float64).tiny
+_fmax = np.finfo(np.float64).max
+
+
+def vectorize(signatures):
+    """decorator compiling a scalar function into a numpy ufunc with
+    `numba.vectorize`, if numba is not available the function is returned
+    unchanged, it should then support numpy arrays via broadcasting"""
+    if numba_available:
+        return nb.vectorize(signatures, cache=True)
+    return lambda func: func
+
+
+if numba_available:
+
+    @nb.njit(cache=True, fastmath=True, boundscheck=False, nogil=True)
+    def _trapz_loglog_axis(y, x, log_x):
+        """log-log trapezoidal integration of a 2-dimensional array along its
+        first axis, each column is integrated independently. The rows are
+        processed in order, such that the inner loops run along the contiguous
+        axis, and the log of each row is computed only once."""
+        n, m = y.shape
+        result = np.zeros(m)
+        log_y_low = np.empty(m)
+        log_y_up = np.empty(m)
+        for j in range(m):
+            log_y_low[j] = np.log(min(max(y[0, j], _ftiny), _fmax))
+        for i in range(n - 1):
+            for j in range(m):
+                log_y_up[j] = np.log(min(max(y[i + 1, j], _ftiny), _fmax))
+            if x[i] != x[i + 1]:
+                d_log_x = log_x[i + 1] - log_x[i]
+                x_low = x[i]
+                x_up = x[i + 1]
+                for j in range(m):
+                    y_low = y[i, j]
+                    y_up = y[i + 1, j]
+                    # slope in the given logarithmic bin, plus one
+                    m_1 = (log_y_up[j] - log_y_low[j]) / d_log_x + 1
+                    # y_up = y_low * (x_up / x_low) ** m, the integral of the
+                    # power law does not need the power to be evaluated
+                    value = (
+                        (x_up * y_up - x_low * y_low) / m_1
+                        if abs(m_1) > 1e-10
+                        else x_low * y_low * d_log_x
+                    )
+                    # branchless selections, for the loop to be vectorized
+                    result[j] += value if (y_low != 0.0) & (y_up != 0.0) else 0.0
+            # the upper row of this interval is the lower one of the next
+            log_y_low, log_y_up = log_y_up, log_y_low
+        return result
+
+    @nb.njit(cache=True, fastmath=True, boundscheck=False, nogil=True, parallel=True)
+    def _simpson_loglog_axis(y, x, log_x):
+        """composite Simpson's rule of x * y in log(x), for a 2-dimensional
+        array along its first axis, the number of points has to be odd"""
+        n, m = y.shape
+        result = np.zeros(m)
+        for j in nb.prange(m):
+            total = 0.0
+            for i in range(0, n - 2, 2):
+                h_0 = log_x[i + 1] - log_x[i]
+                h_1 = log_x[i + 2] - log_x[i + 1]
+                f_0 = x[i] * y[i, j]
+                f_1 = x[i + 1] * y[i + 1, j]
+                f_2 = x[i + 2] * y[i + 2, j]
+                # Simpson's rule for two unequal intervals
+                total += (
+                    (h_0 + h_1)
+                    / 6
+                    * (
+                        (2 - h_1 / h_0) * f_0
+                        + (h_0 + h_1) ** 2 / (h_0 * h_1) * f_1
+                        + (2 - h_0 / h_1) * f_2
+                    )
+                )
+            result[j] = total
+        return result
+
+
+def _to_columns(y, x, axis, log_x):
+    """move the integration axis of `y` first and flatten the remaining ones,
+    such that each column is integrated separately, returns contiguous float64
+    arrays and the shape of the result"""
+    y = np.moveaxis(np.asarray(y, dtype=np.float64), axis, 0)
+    out_shape = y.shape[1:]
+    y = np.ascontiguousarray(y.reshape(y.shape[0], -1))
+    x = np.ascontiguousarray(np.ravel(x), dtype=np.float64)
+    if log_x is None:
+        log_x = np.log(np.clip(x, _ftiny, _fmax))
+    log_x = np.ascontiguousarray(np.ravel(log_x), dtype=np.float64)
+    return y, x, log_x, out_shape
+
+
+def trapz_loglog_jit(y, x, axis=0, log_x=None):
+    """numba-compiled version of :func:`~agnpy.utils.math.trapz_loglog`,
+    unitless arrays are expected and `x` has to be 1-dimensional
+
+    Parameters
+    ----------
+    y : :class:`~numpy.ndarray`
+        array to integrate
+    x : :class:`~numpy.ndarray`
+        1-dimensional independent variable to integrate over
+    axis : int, optional
+        along which axis the integration has to be performed
+    log_x : :class:`~numpy.ndarray`, optional
+        natural logarithm of `x`, if already available
+
+    Returns
+    -------
+    trapz : float or :class:`~numpy.ndarray`
+        Definite integral as approximated by trapezoidal rule in loglog space.
+    """
+    y, x, log_x, out_shape = _to_columns(y, x, axis, log_x)
+    return _trapz_loglog_axis(y, x, log_x).reshape(out_shape)[()]
+
+
+def simpson_loglog_jit(y, x, axis=0, log_x=None):
+    """numba-compiled version of :func:`~agnpy.utils.math.simpson_loglog`,
+    unitless arrays are expected, `x` has to be 1-dimensional and to have an
+    odd number of points
+
+    Parameters
+    ----------
+    y : :class:`~numpy.ndarray`
+        array to integrate
+    x : :class:`~numpy.ndarray`
+        1-dimensional independent variable to integrate over
+    axis : int, optional
+        along which axis the integration has to be performed
+    log_x : :class:`~numpy.ndarray`, optional
+        natural logarithm of `x`, if already available
+
+    Returns
+    -------
+    simpson : float or :class:`~numpy.ndarray`
+        Definite integral as approximated by Simpson's rule in log space.
+    """
+    y, x, log_x, out_shape = _to_columns(y, x, axis, log_x)
+    return _simpson_loglog_axis(y, x, log_x).reshape(out_shape)[()]
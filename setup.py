@@ -20,6 +20,6 @@ setuptools.setup(
         "License :: OSI Approved :: BSD License",
         "Operating System :: OS Independent",
     ],
-    install_requires=["astropy>=4.0", "numpy>=1.17", "scipy>=1.2", "matplotlib"],
+    install_requires=["astropy>=4.0", "numpy>=1.17", "scipy>=1.6", "matplotlib"],
     python_requires=">=3.8",
 )